@@ -18,24 +18,82 @@ Author: Hailo AI People Counter API
 Dependencies: Flask, pandas, datetime
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 import pandas as pd
+import numpy as np
 import csv
+import functools
+import hashlib
+import io
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
 
+try:
+    import orjson
+except ImportError:  # fall back to Flask's JSON encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+except ImportError:  # fall back to pandas' C parser, no Parquet sidecar
+    pa = None
+    pq = None
+    pa_csv = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # serve responses uncompressed
+    Compress = None
+
 app = Flask(__name__)
 
+# Compress JSON responses; brotli is preferred, gzip for clients without it.
+# Streamed responses (NDJSON) stay uncompressed: Flask-Compress would buffer the
+# whole stream before sending the first byte.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_STREAMS'] = False
+if Compress is not None:
+    Compress(app)
+
 # Configuration
 CSV_FILE = Path(__file__).parent.parent / "People-Counter" / "people_count_log.csv"
 PORT = 8000
 
+# CSV schema written by People-Counter/main.py
+CSV_COLUMNS = ['Timestamp', 'Minute', 'Hour', 'Day', 'People_This_Minute',
+               'People_This_Hour', 'People_This_Day', 'Total_Unique_People']
+CSV_HEADER = ','.join(CSV_COLUMNS).encode('utf-8')
+# Column types for pyarrow's CSV reader, so it doesn't have to infer them
+ARROW_COLUMN_TYPES = (dict(zip(CSV_COLUMNS, [pa.timestamp('s')] + [pa.int64()] * 7))
+                      if pa is not None else None)
+
+# Timestamp format Flask's JSON encoder uses for datetimes (RFC 822, naive = UTC)
+HTTP_DATE_FORMAT = '%a, %d %b %Y %H:%M:%S GMT'
+
+# The parsed data (cached or in the Parquet sidecar) identifies the CSV it came from
+# by its inode and a hash of its first bytes, so a replaced log is parsed from scratch
+CSV_HEAD_BYTES = 4096
+# The sidecar is rewritten at most this often as rows are appended
+SIDECAR_REFRESH_SECONDS = 600
+
+# Parsed CSV cache shared by all endpoints, keyed on the file's (mtime, size)
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
 def load_csv_data():
     """
     Load and parse the CSV data, skipping comment lines.
     
+    The parsed DataFrame is cached and only re-parsed when the CSV file's
+    modification time or size changes.
+    
     Returns:
         pandas.DataFrame: Parsed CSV data
     """
@@ -51,65 +109,56 @@ def load_csv_data():
             print("Please check file permissions or run with appropriate access")
             return pd.DataFrame()
         
-        # Read CSV file, skipping comment lines that start with #
-        data = []
-        header_found = False
-        header = None
-        
-        with open(CSV_FILE, 'r', newline='', encoding='utf-8') as file:
-            for line in file:
-                line = line.strip()
-                # Skip comment lines and empty rows
-                if not line or line.startswith('#') or line.startswith('"#'):
-                    continue
-                
-                # Handle malformed CSV where header and data are concatenated
-                if not header_found:
-                    # Split the line to separate header from data
-                    if 'Timestamp,Minute,Hour,Day,People_This_Minute,People_This_Hour,People_This_Day,Total_Unique_People' in line:
-                        # Extract the data part after the header
-                        data_part = line.split('Total_Unique_People', 1)[1]
-                        header = ['Timestamp', 'Minute', 'Hour', 'Day', 'People_This_Minute', 'People_This_Hour', 'People_This_Day', 'Total_Unique_People']
-                        header_found = True
-                        
-                        # Parse the data part
-                        if data_part:
-                            # Split by comma and create data row
-                            values = data_part.split(',')
-                            if len(values) >= 8:
-                                data.append(values[:8])
-                    else:
-                        # Try to parse as regular CSV
-                        row = list(csv.reader([line]))[0]
-                        if len(row) >= 8:
-                            header = ['Timestamp', 'Minute', 'Hour', 'Day', 'People_This_Minute', 'People_This_Hour', 'People_This_Day', 'Total_Unique_People']
-                            header_found = True
-                            data.append(row[:8])
-                else:
-                    # This is a data row
-                    row = list(csv.reader([line]))[0]
-                    if len(row) >= 8:
-                        data.append(row[:8])
-        
-        if not data or not header:
-            print(f"CSV file is empty or contains no valid data: {CSV_FILE}")
-            return pd.DataFrame()
-        
-        # Create DataFrame with proper column names
-        df = pd.DataFrame(data, columns=header)
-        
-        # Convert timestamp to datetime
-        if 'Timestamp' in df.columns:
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-        
-        # Convert numeric columns
-        numeric_columns = ['Minute', 'Hour', 'Day', 'People_This_Minute', 
-                          'People_This_Hour', 'People_This_Day', 'Total_Unique_People']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        print(f"Successfully loaded {len(df)} records from CSV")
+        # Serve the cached DataFrame if the file hasn't changed since it was parsed
+        st = CSV_FILE.stat()
+        key = (CSV_FILE, st.st_mtime_ns, st.st_size)
+        with _CACHE_LOCK:
+            if _CACHE.get('key') == key:
+                return _CACHE['df']
+            
+            # The people counter only appends rows, so when the same file has grown we
+            # parse just the new bytes. Anything else (rotation, rewrite) reloads fully.
+            cached_key = _CACHE.get('key')
+            appending = (cached_key is not None and cached_key[0] == CSV_FILE
+                         and st.st_size > cached_key[2] and st.st_ino == _CACHE['inode']
+                         and _csv_head_hash(min(_CACHE['offset'], CSV_HEAD_BYTES)) == _CACHE['head_hash'])
+            if appending:
+                offset, df = _CACHE['offset'], _CACHE['df']
+            else:
+                # Cold start: resume from the Parquet sidecar if it is up to date
+                df, offset = _load_parquet_sidecar(st)
+            
+            full_parse = offset == 0
+            new_df, offset = _parse_csv_file(offset)
+            sidecar_age = time.monotonic() - _CACHE.get('sidecar_written', float('-inf'))
+            previous_rows = len(df)
+            if df.empty:
+                df = new_df
+            elif not new_df.empty:
+                df = pd.concat([df, new_df], ignore_index=True)
+            # Keep rows in time order so look-back windows can be binary searched
+            if not df.empty and not df['Timestamp'].is_monotonic_increasing:
+                df = df.sort_values('Timestamp', kind='stable', ignore_index=True)
+                appending = False
+            # Save the parsed data after a full parse, and refresh it now and then as
+            # rows are appended so a restart only has to parse the recent rows
+            if not df.empty and (full_parse or (not new_df.empty and sidecar_age >= SIDECAR_REFRESH_SECONDS)):
+                _write_parquet_sidecar(df, offset, st)
+                _CACHE['sidecar_written'] = time.monotonic()
+            
+            # Appended rows only update the aggregates; anything else rebuilds them
+            if appending and previous_rows:
+                hourly, daily = _extend_aggregates(df, _CACHE['hourly'], _CACHE['daily'], previous_rows)
+            else:
+                hourly, daily = _build_aggregates(df)
+            
+            _CACHE['key'] = key
+            _CACHE['offset'] = offset
+            _CACHE['inode'] = st.st_ino
+            _CACHE['head_hash'] = _csv_head_hash(min(offset, CSV_HEAD_BYTES))
+            _CACHE['df'] = df
+            _CACHE['hourly'], _CACHE['daily'] = hourly, daily
+            _CACHE['summary'] = None  # rebuilt by the next /data/summary request
         return df
     except PermissionError as e:
         print(f"Permission error accessing CSV file: {e}")
@@ -126,6 +175,479 @@ def load_csv_data():
         print(f"File: {CSV_FILE}")
         return pd.DataFrame()
 
+def load_aggregated_data():
+    """
+    Load the CSV data together with its precomputed hourly and daily aggregates.
+    
+    Returns:
+        tuple: (all data, latest entry per hour of day, latest entry per day)
+               as pandas.DataFrames
+    """
+    df = load_csv_data()
+    with _CACHE_LOCK:
+        if _CACHE.get('df') is df:
+            return df, _CACHE['hourly'], _CACHE['daily']
+    return (df,) + _build_aggregates(df)
+
+def _build_aggregates(df):
+    """
+    Select the latest entry for each hour of the day and for each day.
+    
+    The data is sorted by time, so the latest entry of an hour (or day) inside
+    any look-back window is also its latest entry overall. Endpoints can
+    therefore filter these small frames instead of scanning all the data.
+    Both frames keep the row positions of the full data as their index.
+    
+    Args:
+        df (pandas.DataFrame): Parsed CSV data
+    
+    Returns:
+        tuple: (hourly pandas.DataFrame ordered by hour, daily pandas.DataFrame)
+    """
+    if df.empty:
+        return df, df
+    
+    # Position of the last row for each hour of the day: one scatter-max pass over
+    # the hour array into 24 buckets, without a groupby hash table
+    timestamps = df['Timestamp'].to_numpy()
+    valid = ~np.isnat(timestamps)
+    hours = timestamps[valid].astype('datetime64[h]').astype(np.int64) % 24
+    last_positions = np.full(24, -1, dtype=np.int64)
+    np.maximum.at(last_positions, hours, np.flatnonzero(valid))
+    hourly = df.iloc[last_positions[last_positions >= 0]]
+    
+    # Last row of each day in a single hash groupby
+    daily = df.groupby('Day', sort=False).tail(1)
+    
+    return hourly, daily
+
+def _extend_aggregates(df, hourly, daily, start):
+    """
+    Update the hourly and daily aggregates after rows were appended to the data.
+    
+    The latest entry of an hour or day is either one of the new rows or was
+    already in the previous aggregates, so only those rows are aggregated again
+    instead of the whole data.
+    
+    Args:
+        df (pandas.DataFrame): Parsed CSV data, including the appended rows
+        hourly (pandas.DataFrame): Hourly aggregate of the data before the append
+        daily (pandas.DataFrame): Daily aggregate of the data before the append
+        start (int): Position of the first appended row
+    
+    Returns:
+        tuple: (hourly pandas.DataFrame ordered by hour, daily pandas.DataFrame)
+    """
+    # Candidate rows in time order; their index keeps the positions in the full data
+    candidates = np.union1d(np.union1d(hourly.index, daily.index), np.arange(start, len(df)))
+    return _build_aggregates(df.iloc[candidates])
+
+def _build_summary(df):
+    """
+    Compute the summary statistics served by /data/summary.
+    
+    Args:
+        df (pandas.DataFrame): Parsed CSV data (not empty)
+    
+    Returns:
+        dict: Record count, date range, maximum/average counts and current totals
+    """
+    # Calculate summary statistics. The counters are reduced in a single agg
+    # call, and since rows are sorted by time the date range is the first and
+    # last timestamp.
+    counts = df[['People_This_Minute', 'People_This_Hour', 'People_This_Day',
+                 'Total_Unique_People']]
+    stats = counts.agg(['max', 'mean'])
+    current = counts.iloc[-1]
+    summary = {
+        'total_records': len(df),
+        'date_range': {
+            'start': df['Timestamp'].iloc[0].isoformat(),
+            'end': df['Timestamp'].iloc[-1].isoformat()
+        },
+        'people_statistics': {
+            'max_people_this_minute': int(stats.at['max', 'People_This_Minute']),
+            'max_people_this_hour': int(stats.at['max', 'People_This_Hour']),
+            'max_people_this_day': int(stats.at['max', 'People_This_Day']),
+            'max_total_unique_people': int(stats.at['max', 'Total_Unique_People']),
+            'avg_people_this_minute': float(stats.at['mean', 'People_This_Minute']),
+            'avg_people_this_hour': float(stats.at['mean', 'People_This_Hour']),
+            'avg_people_this_day': float(stats.at['mean', 'People_This_Day'])
+        },
+        'current_totals': {
+            'people_this_minute': int(current['People_This_Minute']),
+            'people_this_hour': int(current['People_This_Hour']),
+            'people_this_day': int(current['People_This_Day']),
+            'total_unique_people': int(current['Total_Unique_People'])
+        }
+    }
+    return summary
+
+def read_last_row(path, tail_bytes=4096):
+    """
+    Read and parse only the last data row of the CSV file.
+    
+    Seeks to the end of the file instead of parsing the whole log, which keeps
+    frequently polled endpoints cheap.
+    
+    Args:
+        path (Path): CSV file to read
+        tail_bytes (int): Number of bytes to read from the end of the file
+    
+    Returns:
+        dict: Column name to value for the last row, or None if no complete
+              row was found in the tail
+    """
+    try:
+        with open(path, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+            size = file.tell()
+            start = max(0, size - tail_bytes)
+            file.seek(start)
+            tail = file.read()
+    except OSError:
+        return None
+    
+    lines = tail.decode('utf-8', errors='replace').splitlines()
+    # Drop a row that is still being written and, unless we read from the
+    # start of the file, the first line which was probably cut in half
+    if lines and not tail.endswith(b'\n'):
+        lines.pop()
+    if lines and start > 0:
+        lines.pop(0)
+    
+    header = CSV_HEADER.decode('utf-8')
+    for line in reversed(lines):
+        line = line.strip()
+        if not line or line.startswith('#') or line.startswith('"#'):
+            continue
+        
+        # Handle malformed CSV where header and data are concatenated
+        header_line = header in line
+        if header_line:
+            line = line.split(header, 1)[1]
+        
+        # Fields are plain numbers and an unquoted timestamp, so a split is
+        # enough; only quoted lines need the csv module
+        if '"' in line:
+            row = next(csv.reader([line]), [])
+        else:
+            row = line.split(',') if line else []
+        if len(row) >= 8:
+            return _parse_row(row)
+        if header_line:
+            break
+    return None
+
+def _parse_row(row):
+    """
+    Convert the fields of one log line using the fixed CSV schema.
+    
+    Args:
+        row (list): At least eight field strings, in CSV_COLUMNS order
+    
+    Returns:
+        dict: Column name to parsed value
+    """
+    timestamp, minute, hour, day, this_minute, this_hour, this_day, total = row[:8]
+    return {
+        'Timestamp': pd.to_datetime(timestamp, errors='coerce'),
+        'Minute': _to_number(minute),
+        'Hour': _to_number(hour),
+        'Day': _to_number(day),
+        'People_This_Minute': _to_number(this_minute),
+        'People_This_Hour': _to_number(this_hour),
+        'People_This_Day': _to_number(this_day),
+        'Total_Unique_People': _to_number(total),
+    }
+
+def _to_number(value):
+    """
+    Convert a CSV field to int or float, using NaN for invalid values.
+    
+    Args:
+        value (str): Field text
+    
+    Returns:
+        int or float: Parsed number
+    """
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return float('nan')
+
+def csv_conditional(view):
+    """
+    Answer conditional GETs for an endpoint whose response depends only on the CSV file.
+    
+    Responses carry a weak ETag built from the file's modification time and size.
+    When the client's If-None-Match already names the current version, a 304 is
+    returned without loading or serializing any data.
+    
+    Args:
+        view (function): Flask view function to wrap
+    
+    Returns:
+        function: Wrapped view function
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            st = CSV_FILE.stat()
+        except OSError:
+            return view(*args, **kwargs)
+        
+        etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        # Flask-Compress appends the encoding to the ETag of compressed responses
+        # (W/"<etag>:br"), so clients revalidate with that form
+        etags = [etag] + [f"{etag}:{algorithm}" for algorithm in app.config['COMPRESS_ALGORITHM']]
+        matched = next((tag for tag in etags if request.if_none_match.contains_weak(tag)), None)
+        if matched is not None:
+            # Flask-Compress leaves 304s alone, so send back the validator the client
+            # holds, and say which header it depends on, as on the compressed 200
+            response = Response(status=304)
+            response.vary.add('Accept-Encoding')
+            etag = matched
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        # Weak, since the generated 'timestamp' field differs between responses
+        response.set_etag(etag, weak=True)
+        response.last_modified = st.st_mtime
+        # Clients may keep the response but must revalidate it before reuse
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
+
+def fast_json(obj):
+    """
+    Serialize a response with orjson, falling back to jsonify.
+    
+    Args:
+        obj: JSON-serializable object (numpy scalars and arrays allowed)
+    
+    Returns:
+        flask.Response: JSON response
+    """
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC),
+                    mimetype='application/json')
+
+def _ndjson_records(df, batch_size=10000):
+    """
+    Serialize DataFrame rows as newline-delimited JSON, one batch at a time.
+    
+    Only one batch of records exists as Python objects at any time, so memory
+    stays bounded and the first rows are sent before the rest are serialized.
+    
+    Args:
+        df (pandas.DataFrame): Rows to serialize
+        batch_size (int): Number of rows converted per chunk
+    
+    Yields:
+        bytes: One chunk of NDJSON lines
+    """
+    dumps = orjson.dumps if orjson is not None else lambda obj: json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        batch = batch.assign(Timestamp=batch['Timestamp'].dt.strftime(HTTP_DATE_FORMAT))
+        yield b''.join(dumps(record) + b'\n' for record in batch.to_dict('records'))
+
+def _load_parquet_sidecar(csv_stat):
+    """
+    Load the Parquet copy of the CSV data if it was built from this CSV file.
+    
+    The CSV only grows by appends, so the sidecar stays usable while the file
+    is the same one (same inode and first bytes) and at least as long as the
+    part the sidecar covers. Rows after that offset are parsed by the caller.
+    
+    Args:
+        csv_stat (os.stat_result): Current stat of the CSV file
+    
+    Returns:
+        tuple: (pandas.DataFrame, CSV byte offset it covers), or an empty
+               DataFrame and offset 0 if there is no usable sidecar
+    """
+    parquet_file = CSV_FILE.with_suffix('.parquet')
+    if pq is None or not parquet_file.exists():
+        return pd.DataFrame(), 0
+    
+    try:
+        table = pq.read_table(parquet_file)
+        metadata = table.schema.metadata
+        offset = int(metadata[b'csv_offset'])
+        if offset > csv_stat.st_size or metadata.get(b'csv_inode') != str(csv_stat.st_ino).encode('ascii'):
+            return pd.DataFrame(), 0
+        if metadata.get(b'csv_head_sha1') != _csv_head_hash(min(offset, CSV_HEAD_BYTES)):
+            return pd.DataFrame(), 0
+        return table.to_pandas(), offset
+    except Exception as e:
+        print(f"Ignoring unreadable Parquet cache {parquet_file}: {e}")
+        return pd.DataFrame(), 0
+
+def _write_parquet_sidecar(df, offset, csv_stat):
+    """
+    Save the parsed CSV data as Parquet next to the CSV file.
+    
+    Args:
+        df (pandas.DataFrame): Parsed CSV data
+        offset (int): CSV byte offset the data covers
+        csv_stat (os.stat_result): Stat of the CSV file the data was parsed from
+    """
+    if pq is None:
+        return
+    
+    parquet_file = CSV_FILE.with_suffix('.parquet')
+    tmp_file = parquet_file.with_name(f"{parquet_file.name}.{os.getpid()}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'csv_offset'] = str(offset).encode('ascii')
+        metadata[b'csv_inode'] = str(csv_stat.st_ino).encode('ascii')
+        metadata[b'csv_head_sha1'] = _csv_head_hash(min(offset, CSV_HEAD_BYTES))
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_file, compression='zstd')
+        # Atomic replace so concurrent readers never see a partial file
+        os.replace(tmp_file, parquet_file)
+    except Exception as e:
+        print(f"Could not write Parquet cache {parquet_file}: {e}")
+        tmp_file.unlink(missing_ok=True)
+
+def _csv_head_hash(length):
+    """
+    Hash the first bytes of the CSV file, to tell whether it was replaced.
+    
+    Args:
+        length (int): Number of bytes to hash
+    
+    Returns:
+        bytes: Hex SHA-1 digest of the bytes
+    """
+    with open(CSV_FILE, 'rb') as file:
+        return hashlib.sha1(file.read(length)).hexdigest().encode('ascii')
+
+def _parse_csv_file(offset=0):
+    """
+    Parse the CSV file from a byte offset into a DataFrame.
+    
+    Only complete lines are consumed, so a row that is still being written
+    is picked up on the next call.
+    
+    Args:
+        offset (int): Byte offset to start reading from (0 for the whole file)
+    
+    Returns:
+        tuple: (pandas.DataFrame of the parsed rows, byte offset to resume from)
+    """
+    with open(CSV_FILE, 'rb') as file:
+        file.seek(offset)
+        raw = file.read()
+    end = raw.rfind(b'\n') + 1
+    next_offset = offset + end
+
+    # Skip the comment/header preamble, then let pandas' C parser handle the rows.
+    # The preamble only exists at the start of the file, so appended chunks are
+    # handed to the parser as-is.
+    body = _strip_preamble(raw[:end]) if offset == 0 else raw[:end]
+    if not body.strip():
+        if offset == 0:
+            print(f"CSV file is empty or contains no valid data: {CSV_FILE}")
+        return pd.DataFrame(), next_offset
+
+    df = _read_csv_rows(body)
+    # Rows with fewer than 8 fields are incomplete
+    df = df.dropna(subset=[CSV_COLUMNS[-1]]).reset_index(drop=True)
+
+    if df.empty:
+        if offset == 0:
+            print(f"CSV file is empty or contains no valid data: {CSV_FILE}")
+        return df, next_offset
+
+    # Convert timestamp to datetime (the log has one-second resolution). Rows
+    # without a valid timestamp can't be placed in time and are dropped.
+    if 'Timestamp' in df.columns:
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce').astype('datetime64[s]')
+        df = df.dropna(subset=['Timestamp']).reset_index(drop=True)
+
+    # Convert numeric columns, downcasting to the smallest integer type that fits
+    numeric_columns = ['Minute', 'Hour', 'Day', 'People_This_Minute', 
+                      'People_This_Hour', 'People_This_Day', 'Total_Unique_People']
+    # Assign all converted columns at once rather than inserting them one by one
+    converted = {col: pd.to_numeric(df[col], errors='coerce', downcast='integer')
+                 for col in numeric_columns if col in df.columns}
+    df = df.assign(**converted)
+
+    # Appends arrive every few seconds; only report full loads unless debugging
+    if offset == 0 or os.environ.get('API_DEBUG'):
+        print(f"Successfully loaded {len(df)} records from CSV")
+    return df, next_offset
+
+def _read_csv_rows(body):
+    """
+    Parse header-less CSV data rows into a DataFrame.
+    
+    Uses pyarrow's multithreaded CSV reader when it is installed and falls
+    back to pandas' C parser otherwise.
+    
+    Args:
+        body (bytes): CSV data rows
+    
+    Returns:
+        pandas.DataFrame: Parsed rows with CSV_COLUMNS as column names
+    """
+    if pa_csv is not None:
+        try:
+            # Comment lines and short rows fail the column count check and are skipped
+            table = pa_csv.read_csv(
+                io.BytesIO(body),
+                read_options=pa_csv.ReadOptions(column_names=CSV_COLUMNS),
+                parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+                convert_options=pa_csv.ConvertOptions(column_types=ARROW_COLUMN_TYPES))
+            return table.to_pandas()
+        except pa.ArrowInvalid as e:
+            # e.g. a malformed value after type inference; the C parser coerces instead
+            print(f"pyarrow could not parse CSV, falling back to pandas: {e}")
+    
+    return pd.read_csv(io.BytesIO(body), names=CSV_COLUMNS, header=None, comment='#',
+                       skipinitialspace=True, on_bad_lines='skip', engine='c')
+
+def _strip_preamble(raw):
+    """
+    Return the CSV bytes that follow the comment lines and column header.
+    
+    Handles the malformed file layout where the first data row was written on
+    the same line as the header.
+    
+    Args:
+        raw (bytes): CSV file contents
+    
+    Returns:
+        bytes: Data rows only
+    """
+    pos = raw.find(CSV_HEADER)
+    if pos != -1:
+        return raw[pos + len(CSV_HEADER):]
+    
+    # No header line: skip leading comment lines and empty rows
+    start = 0
+    while start < len(raw):
+        line_end = raw.find(b'\n', start) + 1 or len(raw)
+        line = raw[start:line_end].strip()
+        if line and not line.startswith((b'#', b'"#')):
+            break
+        start = line_end
+    return raw[start:]
+
+@app.before_request
+def set_request_time():
+    """Capture the request time once for timestamps and look-back windows."""
+    g.now = datetime.now()
+    g.now_iso = g.now.isoformat()
+
 @app.route('/')
 def api_info():
     """
@@ -148,10 +670,11 @@ def api_info():
             'GET /data/current': 'Current time period data'
         },
         'csv_file': str(CSV_FILE),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.route('/data')
+@csv_conditional
 def get_all_data():
     """
     Get all CSV data.
@@ -159,6 +682,7 @@ def get_all_data():
     Query Parameters:
         limit (int): Maximum number of records to return
         offset (int): Number of records to skip
+        format (str): 'ndjson' to stream one JSON record per line
     
     Returns:
         JSON: All CSV data
@@ -177,13 +701,20 @@ def get_all_data():
     elif offset:
         df = df.iloc[offset:]
     
-    return jsonify({
-        'data': df.to_dict('records'),
+    if request.args.get('format') == 'ndjson':
+        return Response(_ndjson_records(df), mimetype='application/x-ndjson')
+    
+    # Format timestamps up front so the records serialize without a Python fallback
+    records = df.assign(Timestamp=df['Timestamp'].dt.strftime(HTTP_DATE_FORMAT))
+    
+    return fast_json({
+        'data': records.to_dict('records'),
         'total_records': len(df),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.route('/data/latest')
+@csv_conditional
 def get_latest_data():
     """
     Get the latest data entry.
@@ -191,19 +722,24 @@ def get_latest_data():
     Returns:
         JSON: Latest data entry
     """
-    df = load_csv_data()
+    # Fast path: parse only the last line of the file
+    latest = read_last_row(CSV_FILE)
     
-    if df.empty:
-        return jsonify({'error': 'No data available'}), 404
-    
-    latest = df.iloc[-1].to_dict()
+    if latest is None:
+        df = load_csv_data()
+        
+        if df.empty:
+            return jsonify({'error': 'No data available'}), 404
+        
+        latest = df.iloc[-1].to_dict()
     
     return jsonify({
         'latest_data': latest,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.route('/data/summary')
+@csv_conditional
 def get_summary():
     """
     Get summary statistics.
@@ -216,33 +752,18 @@ def get_summary():
     if df.empty:
         return jsonify({'error': 'No data available'}), 404
     
-    # Calculate summary statistics
-    summary = {
-        'total_records': len(df),
-        'date_range': {
-            'start': df['Timestamp'].min().isoformat(),
-            'end': df['Timestamp'].max().isoformat()
-        },
-        'people_statistics': {
-            'max_people_this_minute': int(df['People_This_Minute'].max()),
-            'max_people_this_hour': int(df['People_This_Hour'].max()),
-            'max_people_this_day': int(df['People_This_Day'].max()),
-            'max_total_unique_people': int(df['Total_Unique_People'].max()),
-            'avg_people_this_minute': float(df['People_This_Minute'].mean()),
-            'avg_people_this_hour': float(df['People_This_Hour'].mean()),
-            'avg_people_this_day': float(df['People_This_Day'].mean())
-        },
-        'current_totals': {
-            'people_this_minute': int(df['People_This_Minute'].iloc[-1]),
-            'people_this_hour': int(df['People_This_Hour'].iloc[-1]),
-            'people_this_day': int(df['People_This_Day'].iloc[-1]),
-            'total_unique_people': int(df['Total_Unique_People'].iloc[-1])
-        }
-    }
+    # The statistics only change with the data, so they are computed once per load
+    with _CACHE_LOCK:
+        summary = _CACHE.get('summary') if _CACHE.get('df') is df else None
+    if summary is None:
+        summary = _build_summary(df)
+        with _CACHE_LOCK:
+            if _CACHE.get('df') is df:
+                _CACHE['summary'] = summary
     
     return jsonify({
         'summary': summary,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.route('/data/hourly')
@@ -256,39 +777,33 @@ def get_hourly_data():
     Returns:
         JSON: Hourly aggregated data
     """
-    df = load_csv_data()
+    df, hourly_df, _ = load_aggregated_data()
     
     if df.empty:
         return jsonify({'error': 'No data available'}), 404
     
     hours = request.args.get('hours', type=int, default=24)
     
-    # Filter data for the specified number of hours
-    cutoff_time = datetime.now() - timedelta(hours=hours)
-    recent_df = df[df['Timestamp'] >= cutoff_time]
+    # Keep the latest entry of each hour (0-23) that falls in the look-back window.
+    # The data is sorted by time, so the window start is found by binary search.
+    cutoff_time = g.now - timedelta(hours=hours)
+    start = df['Timestamp'].searchsorted(pd.Timestamp(cutoff_time).ceil('s'))
+    recent_df = hourly_df[hourly_df.index >= start]
     
     if recent_df.empty:
         return jsonify({'error': f'No data available for the last {hours} hours'}), 404
     
-    # Group by actual hour (0-23) from timestamp
-    hourly_data = []
-    for hour in range(24):
-        # Get data for this hour
-        hour_df = recent_df[recent_df['Timestamp'].dt.hour == hour]
-        if not hour_df.empty:
-            # Get the latest entry for this hour
-            hour_data = hour_df.iloc[-1]
-            hourly_data.append({
-                'hour': hour,
-                'timestamp': hour_data['Timestamp'].isoformat(),
-                'people_this_hour': int(hour_data['People_This_Hour']),
-                'total_unique_people': int(hour_data['Total_Unique_People'])
-            })
+    hourly_data = [{
+        'hour': row.Timestamp.hour,
+        'timestamp': row.Timestamp.isoformat(),
+        'people_this_hour': int(row.People_This_Hour),
+        'total_unique_people': int(row.Total_Unique_People)
+    } for row in recent_df.itertuples()]
     
     return jsonify({
         'hourly_data': hourly_data,
         'hours_analyzed': hours,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.route('/data/daily')
@@ -302,35 +817,33 @@ def get_daily_data():
     Returns:
         JSON: Daily aggregated data
     """
-    df = load_csv_data()
+    df, _, daily_df = load_aggregated_data()
     
     if df.empty:
         return jsonify({'error': 'No data available'}), 404
     
     days = request.args.get('days', type=int, default=7)
     
-    # Filter data for the specified number of days
-    cutoff_time = datetime.now() - timedelta(days=days)
-    recent_df = df[df['Timestamp'] >= cutoff_time]
+    # Keep the latest entry of each day that falls in the look-back window.
+    # The data is sorted by time, so the window start is found by binary search.
+    cutoff_time = g.now - timedelta(days=days)
+    start = df['Timestamp'].searchsorted(pd.Timestamp(cutoff_time).ceil('s'))
+    recent_df = daily_df.iloc[daily_df.index.searchsorted(start):]
     
     if recent_df.empty:
         return jsonify({'error': f'No data available for the last {days} days'}), 404
     
-    # Group by day and get the latest entry for each day
-    daily_data = []
-    for day in recent_df['Day'].unique():
-        day_data = recent_df[recent_df['Day'] == day].iloc[-1]
-        daily_data.append({
-            'day': int(day),
-            'timestamp': day_data['Timestamp'].isoformat(),
-            'people_this_day': int(day_data['People_This_Day']),
-            'total_unique_people': int(day_data['Total_Unique_People'])
-        })
+    daily_data = [{
+        'day': int(row.Day),
+        'timestamp': row.Timestamp.isoformat(),
+        'people_this_day': int(row.People_This_Day),
+        'total_unique_people': int(row.Total_Unique_People)
+    } for row in recent_df.itertuples()]
     
     return jsonify({
         'daily_data': daily_data,
         'days_analyzed': days,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.route('/data/current')
@@ -347,16 +860,17 @@ def get_current_data():
         return jsonify({'error': 'No data available'}), 404
     
     # Get current time periods
-    now = datetime.now()
+    now = g.now
     current_minute = int(now.timestamp() // 60)
     current_hour = int(now.timestamp() // 3600)
     current_day = int(now.timestamp() // 86400)
     
-    # Get the latest data entry
-    latest = df.iloc[-1]
+    # Get the latest data entry, reading single values instead of building a row Series
+    latest = {col: df[col].iat[-1] for col in ('Timestamp', 'People_This_Minute', 'People_This_Hour',
+                                                 'People_This_Day', 'Total_Unique_People')}
     
     current_data = {
-        'current_time': now.isoformat(),
+        'current_time': g.now_iso,
         'current_periods': {
             'minute': current_minute,
             'hour': current_hour,
@@ -373,7 +887,7 @@ def get_current_data():
     
     return jsonify({
         'current_data': current_data,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': g.now_iso
     })
 
 @app.errorhandler(404)
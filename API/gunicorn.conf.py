@@ -0,0 +1,14 @@
+"""
+Gunicorn settings for the Hailo AI People Counter API.
+
+Usage (from the API directory):
+    gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+bind = '0.0.0.0:8000'
+# A single worker, so the parsed log and its aggregates are held in memory once.
+# Each extra worker would keep its own full copy, refreshed every time a row is
+# appended. Requests are served from that cache, and gevent lets the one worker
+# handle many concurrent clients.
+workers = 1
+worker_class = 'gevent'
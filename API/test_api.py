@@ -0,0 +1,112 @@
+"""
+Tests for the CSV cache and conditional requests of the Hailo AI People Counter API.
+
+Run from the API directory:
+    python -m unittest test_api
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import api
+
+HEADER = ("# Hailo AI People Counter Data - Generated by Vision/main.py\n"
+          "Timestamp,Minute,Hour,Day,People_This_Minute,People_This_Hour,"
+          "People_This_Day,Total_Unique_People\n")
+
+def log_rows(start, count):
+    """Build `count` CSV rows one minute apart, starting at `start`."""
+    rows = []
+    for i in range(count):
+        t = start + timedelta(minutes=i)
+        ts = int(t.timestamp())
+        rows.append(f"{t:%Y-%m-%d %H:%M:%S},{ts // 60},{ts // 3600},{ts // 86400},1,{i % 60},{i},{i}\n")
+    return ''.join(rows)
+
+class CsvCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / 'people_count_log.csv'
+        self.start = datetime(2025, 8, 4, 20, 47, 10)
+        self.csv.write_text(HEADER + log_rows(self.start + timedelta(minutes=100), 100))
+        self.original_csv = api.CSV_FILE
+        api.CSV_FILE = self.csv
+        api._CACHE.clear()
+
+    def tearDown(self):
+        api.CSV_FILE = self.original_csv
+        api._CACHE.clear()
+        self.tmp.cleanup()
+
+    def assert_matches_full_parse(self, df):
+        api._CACHE.clear()
+        self.csv.with_suffix('.parquet').unlink(missing_ok=True)
+        expected = api.load_csv_data()
+        self.assertEqual(len(df), len(expected))
+        self.assertTrue(df.equals(expected))
+
+    def test_append_parses_new_rows(self):
+        api.load_csv_data()
+        with open(self.csv, 'a') as file:
+            file.write(log_rows(self.start + timedelta(minutes=200), 5))
+        df = api.load_csv_data()
+        self.assertEqual(len(df), 105)
+        self.assert_matches_full_parse(df)
+
+    def test_replaced_by_larger_file(self):
+        api.load_csv_data()
+        replacement = self.csv.with_name('replacement.csv')
+        replacement.write_text(HEADER + log_rows(self.start, 3000))
+        os.replace(replacement, self.csv)
+        df = api.load_csv_data()
+        self.assertEqual(len(df), 3000)
+        self.assertEqual(df['Timestamp'].iloc[0], self.start)
+        self.assert_matches_full_parse(df)
+
+    def test_rewritten_in_place_with_larger_log(self):
+        api.load_csv_data()
+        with open(self.csv, 'w') as file:
+            file.write(HEADER + log_rows(self.start, 3000))
+        df = api.load_csv_data()
+        self.assertEqual(len(df), 3000)
+        self.assertEqual(df['Timestamp'].iloc[0], self.start)
+        self.assert_matches_full_parse(df)
+
+    def test_sidecar_of_replaced_file_is_ignored(self):
+        api.load_csv_data()
+        api._CACHE.clear()
+        with open(self.csv, 'w') as file:
+            file.write(HEADER + log_rows(self.start, 3000))
+        df = api.load_csv_data()
+        self.assertEqual(len(df), 3000)
+        self.assertEqual(df['Timestamp'].iloc[0], self.start)
+
+class ConditionalRequestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        csv = Path(self.tmp.name) / 'people_count_log.csv'
+        csv.write_text(HEADER + log_rows(datetime(2025, 8, 4, 20, 47, 10), 100))
+        self.original_csv = api.CSV_FILE
+        api.CSV_FILE = csv
+        api._CACHE.clear()
+        self.client = api.app.test_client()
+
+    def tearDown(self):
+        api.CSV_FILE = self.original_csv
+        api._CACHE.clear()
+        self.tmp.cleanup()
+
+    def test_not_modified_repeats_the_cached_etag(self):
+        for encoding in ['br', 'gzip', 'identity']:
+            response = self.client.get('/data', headers={'Accept-Encoding': encoding})
+            etag = response.headers['ETag']
+            response = self.client.get('/data', headers={'Accept-Encoding': encoding, 'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers['ETag'], etag)
+            self.assertIn('Accept-Encoding', response.headers['Vary'])
+
+if __name__ == '__main__':
+    unittest.main()
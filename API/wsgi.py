@@ -0,0 +1,15 @@
+"""
+WSGI entry point for the Hailo AI People Counter API.
+
+Runs the Flask app under a production server instead of Flask's single-threaded
+development server, e.g.:
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+from api import app, load_csv_data
+
+# Warm the data cache at import time, so the first request doesn't wait for the parse
+load_csv_data()
+
+__all__ = ['app']
@@ -18,14 +18,11 @@ Dependencies: Hailo AI, GStreamer, OpenCV, NumPy
 
 # Standard library imports for file operations, time tracking, and data handling
 from pathlib import Path
-import gi
-gi.require_version('Gst', '1.0')
-from gi.repository import Gst, GLib
+import atexit
 import os
-import numpy as np
-import cv2
-import hailo
 import csv
+import queue
+import sys
 import time
 import threading
 from datetime import datetime
@@ -47,6 +44,13 @@ from hailo_apps.hailo_app_python.core.common.buffer_utils import get_caps_from_p
 from hailo_apps.hailo_app_python.core.gstreamer.gstreamer_app import app_callback_class
 from hailo_apps.hailo_app_python.apps.detection.detection_pipeline import GStreamerDetectionApp
 
+# Time intervals in nanoseconds, for comparisons against time.monotonic_ns()
+MINUTE_NS = 60 * 1_000_000_000
+DEBUG_INTERVAL_NS = 10 * 1_000_000_000
+
+# Number of reused BGR frame buffers; must exceed the frames the display can hold queued
+FRAME_POOL_SIZE = 5
+
 # -----------------------------------------------------------------------------------------------
 # User-defined class to be used in the callback function
 # -----------------------------------------------------------------------------------------------
@@ -69,38 +73,88 @@ class user_app_callback_class(app_callback_class):
         # Track the total number of unique people detected
         self.people_count = 0
         
-        # Set to store unique track IDs to avoid counting the same person multiple times
-        # Each person detected by Hailo gets a unique track ID that persists across frames
-        self.tracked_people = set()
+        # Bitmap of track IDs already counted, to avoid counting the same person multiple times
+        # Each person detected by Hailo gets a unique track ID that persists across frames;
+        # the IDs are small increasing integers, so one byte per ID indexed directly is compact
+        self.seen_people = bytearray(1024)
         
         # Timestamp of the last CSV log entry (used to determine when to log next)
         self.last_log_time = time.time()
         
+        # Formatted "YYYY-MM-DD HH:MM" part of the CSV timestamp and the minute it is for
+        self.timestamp_minute = None
+        self.timestamp_prefix = ""
+        
         # CSV file name for storing people count data - use absolute path
         script_dir = Path(__file__).resolve().parent
         self.csv_file = script_dir / "people_count_log.csv"
         
-        # Thread lock to prevent multiple threads from writing to CSV simultaneously
-        # This ensures data integrity when the callback runs in a separate thread
-        self.csv_lock = threading.Lock()
+        # Rows waiting to be written by the background CSV writer thread. Only that
+        # thread touches the file, so no lock is needed; it keeps the CSV file handle
+        # open between writes (opened on first write)
+        self.csv_queue = queue.SimpleQueue()
+        self.csv_handle = None
         
         # ===== ENHANCED TIME-BASED TRACKING =====
-        # Track people detected in different time periods
-        self.current_minute_people = set()
-        self.current_hour_people = set()
-        self.current_day_people = set()
+        # Track people detected in different time periods: a bitmap of the track IDs
+        # seen in each period (same layout as seen_people) and how many are set
+        self.minute_seen = bytearray(len(self.seen_people))
+        self.hour_seen = bytearray(len(self.seen_people))
+        self.day_seen = bytearray(len(self.seen_people))
+        self.minute_people_count = 0
+        self.hour_people_count = 0
+        self.day_people_count = 0
         
         # Track the current time periods we're counting
         self.current_minute = int(time.time() // 60)
         self.current_hour = int(time.time() // 3600)
         self.current_day = int(time.time() // 86400)
         
+        # Monotonic deadline (in ns) of the next wall-clock minute boundary; the
+        # callback only works out the current minute/hour/day once it has passed
+        self.next_period_check_ns = 0
+        self.schedule_period_check()
+        
         # ===== DEBUGGING VARIABLES =====
-        # Last debug time for 10-second updates
-        self.last_debug_time = time.time()
+        # Monotonic deadline (in ns) of the next 10-second debug update
+        self.next_debug_ns = time.monotonic_ns() + DEBUG_INTERVAL_NS
+        
+        # Print every detection of already-counted people, not just new people
+        # (one line per frame); enable with PEOPLE_COUNTER_VERBOSE=1
+        self.verbose = os.environ.get("PEOPLE_COUNTER_VERBOSE") == "1"
+        
+        # ===== CONSOLE LOGGING =====
+        # Console output is written by a background thread so slow stdout writes
+        # never block the GStreamer streaming thread. Messages are dropped when
+        # the queue is full rather than stalling the pipeline.
+        self.log_queue = queue.Queue(maxsize=1024)
+        self.log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self.log_thread.start()
+        
+        # ===== VIDEO CAPS CACHE =====
+        # (format, width, height) of the video, cached after caps negotiation and
+        # cleared by a pad probe whenever the caps change
+        self.video_caps = None
+        self.caps_probe_added = False
+        
+        # ===== FRAME BUFFER POOL =====
+        # Preallocated BGR frames that video frames are converted into, reused in turn
+        self.frame_pool = []
+        self.frame_pool_index = 0
+        
+        # ===== FRAME OVERLAY CACHE =====
+        # Rendered pixels of the text lines drawn on the video, keyed by line and text
+        self.text_overlay = {}
+        self.text_color_band = None
         
         # Initialize the CSV file with headers when the class is created
         self.init_csv_file()
+        
+        # Start the CSV writer so the streaming thread never waits on the disk,
+        # and write out anything still queued when the program exits
+        self.csv_thread = threading.Thread(target=self._csv_worker, daemon=True)
+        self.csv_thread.start()
+        atexit.register(self.close_csv)
 
     def new_function(self):
         """Example function from original code (kept for compatibility)."""
@@ -143,60 +197,151 @@ class user_app_callback_class(app_callback_class):
         except Exception:
             pass
     
-    def log_to_csv(self, people_count):
+    def log(self, message):
+        """
+        Queue a message for the background console logger.
+        
+        Args:
+            message (str): Text to print (a newline is appended, like print)
+        """
+        try:
+            self.log_queue.put_nowait(message)
+        except queue.Full:
+            pass  # Drop the message rather than block the pipeline
+    
+    def _log_worker(self):
+        """Write queued console messages to stdout for the life of the program."""
+        while True:
+            message = self.log_queue.get()
+            sys.stdout.write(message + "\n")
+            sys.stdout.flush()
+    
+    def log_to_csv(self, people_count, current_time=None):
         """
         Log people count data to CSV file with timestamp and statistics.
         
         Args:
             people_count (int): Number of people detected in the current minute
+            current_time (float): Wall-clock time to log, if the caller already has it
         """
         # Get current timestamp for logging
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.time()
         # Calculate current time periods since epoch
         minute = int(current_time // 60)
         hour = int(current_time // 3600)
         day = int(current_time // 86400)
         
-        # Use thread lock to prevent multiple threads from writing simultaneously
-        with self.csv_lock:
-            try:
-                # Open CSV file in append mode to add new data
-                with open(self.csv_file, 'a', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    # Format current timestamp for human readability
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    # Prepare row data for CSV with enhanced statistics
-                    row_data = [timestamp, minute, hour, day, len(self.current_minute_people), len(self.current_hour_people), len(self.current_day_people), len(self.tracked_people)]
-                    # Write the data row to CSV
-                    writer.writerow(row_data)
-                    # Force flush to ensure data is written immediately
-                    file.flush()
-            except Exception as e:
-                # Handle any errors during CSV writing
-                print(f"Error writing to CSV: {e}")
+        # Format current timestamp for human readability; everything but the seconds
+        # only changes once a minute, so that part is formatted once and reused
+        if minute != self.timestamp_minute:
+            self.timestamp_prefix = datetime.fromtimestamp(current_time).strftime("%Y-%m-%d %H:%M")
+            self.timestamp_minute = minute
+        timestamp = f"{self.timestamp_prefix}:{int(current_time % 60):02d}"
+        # Prepare row data for CSV with enhanced statistics
+        row_data = [timestamp, minute, hour, day, self.minute_people_count, self.hour_people_count, self.day_people_count, self.people_count]
+        # Hand the row to the background writer thread
+        self.csv_queue.put(row_data)
         
         # Update the last log time to current time
         self.last_log_time = current_time
     
-    def debug_status(self):
+    def write_csv_rows(self, rows):
+        """
+        Write a batch of rows to the CSV file (called from the writer thread only).
+        The file is kept open between calls and flushed after every batch.
+        
+        Args:
+            rows (list): CSV rows to append
+        """
+        try:
+            # Open CSV file in append mode on first use (or after an error)
+            if self.csv_handle is None:
+                self.csv_handle = open(self.csv_file, 'a', newline='', encoding='utf-8')
+            # Write the data rows to CSV. Every field is a number or a timestamp without
+            # commas, so the rows are joined directly instead of going through csv.writer
+            # (same \r\n line ending as csv.writer)
+            self.csv_handle.write("".join([",".join(map(str, row)) + "\r\n" for row in rows]))
+            # Force flush to ensure data is written immediately
+            self.csv_handle.flush()
+        except Exception as e:
+            # Handle any errors during CSV writing; reopen on the next batch
+            self.log(f"Error writing to CSV: {e}")
+            self.csv_handle = None
+    
+    def _csv_worker(self):
+        """Write queued CSV rows as they arrive, until close_csv queues None."""
+        while True:
+            # Wait for a row, then take everything else already queued as one batch
+            rows = [self.csv_queue.get()]
+            while True:
+                try:
+                    rows.append(self.csv_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in rows
+            rows = [row for row in rows if row is not None]
+            if rows:
+                self.write_csv_rows(rows)
+            if stop:
+                return
+    
+    def close_csv(self):
+        """Stop the CSV writer thread once it has written every queued row."""
+        self.csv_queue.put(None)
+        self.csv_thread.join(timeout=5)
+    
+    def next_frame_buffer(self, height, width):
+        """
+        Get the next preallocated BGR frame buffer, reusing buffers in turn.
+        
+        The pool holds more frames than the display queue, so a buffer is only
+        written again after the frame stored in it has been displayed.
+        
+        Args:
+            height (int): Frame height in pixels
+            width (int): Frame width in pixels
+            
+        Returns:
+            numpy.ndarray: Uninitialized uint8 array of shape (height, width, 3)
+        """
+        if not self.frame_pool or self.frame_pool[0].shape != (height, width, 3):
+            # First frame or the resolution changed: (re)allocate the pool
+            self.frame_pool = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(FRAME_POOL_SIZE)]
+        self.frame_pool_index = (self.frame_pool_index + 1) % FRAME_POOL_SIZE
+        return self.frame_pool[self.frame_pool_index]
+    
+    def schedule_period_check(self):
+        """Set the monotonic deadline of the next wall-clock minute boundary."""
+        ns_until_next_minute = MINUTE_NS - time.time_ns() % MINUTE_NS
+        self.next_period_check_ns = time.monotonic_ns() + ns_until_next_minute
+    
+    def debug_status(self, now_ns=None):
         """
         Print debug status every 10 seconds with current statistics.
+        
+        Args:
+            now_ns (int): Current time.monotonic_ns(), if the caller already has it
         """
-        current_time = time.time()
-        if current_time - self.last_debug_time >= 10:  # Every 10 seconds
-            print(f"\n=== DEBUG STATUS ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ===")
-            print(f"Current Minute People: {len(self.current_minute_people)}")
-            print(f"Current Hour People: {len(self.current_hour_people)}")
-            print(f"Current Day People: {len(self.current_day_people)}")
-            print(f"Total Unique People: {len(self.tracked_people)}")
-            print(f"Frame Count: {self.get_count()}")
-            print(f"Time until next CSV log: {60 - (current_time - self.last_log_time):.1f} seconds")
-            print("=" * 50)
-            self.last_debug_time = current_time
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        if now_ns >= self.next_debug_ns:  # Every 10 seconds
+            current_time = time.time()
+            self.log("\n".join([
+                f"\n=== DEBUG STATUS ({datetime.fromtimestamp(current_time).strftime('%Y-%m-%d %H:%M:%S')}) ===",
+                f"Current Minute People: {self.minute_people_count}",
+                f"Current Hour People: {self.hour_people_count}",
+                f"Current Day People: {self.day_people_count}",
+                f"Total Unique People: {self.people_count}",
+                f"Frame Count: {self.get_count()}",
+                f"Time until next CSV log: {60 - (current_time - self.last_log_time):.1f} seconds",
+                "=" * 50,
+            ]))
+            self.next_debug_ns = now_ns + DEBUG_INTERVAL_NS
     
     def add_person(self, track_id):
         """
-        Add a person to the tracked set and increment count if they're new.
+        Mark a person as seen and increment count if they're new.
         Also tracks people detected in the current minute, hour, and day.
         
         Args:
@@ -205,25 +350,195 @@ class user_app_callback_class(app_callback_class):
         Returns:
             bool: True if this is a new person, False if already tracked
         """
-        # Check if this track ID has been seen before (lifetime tracking)
-        is_new_person = False
-        if track_id not in self.tracked_people:
-            # Add to tracked set and increment total count
-            self.tracked_people.add(track_id)
-            self.people_count += 1
-            is_new_person = True
-        
-        # Add to all current time period tracking
-        self.current_minute_people.add(track_id)
-        self.current_hour_people.add(track_id)
-        self.current_day_people.add(track_id)
-        
-        return is_new_person  # Return whether this is a new person overall
+        # Grow the bitmaps when a new track ID is past their end, at least doubling them
+        if track_id >= len(self.seen_people):
+            padding = bytes(max(track_id + 1, 2 * len(self.seen_people)) - len(self.seen_people))
+            for bitmap in (self.seen_people, self.minute_seen, self.hour_seen, self.day_seen):
+                bitmap.extend(padding)
+        
+        # Check if this track ID has been seen before (lifetime tracking), then mark it
+        # as seen and count it if it was new - without branching on the result
+        was_seen = self.seen_people[track_id]
+        self.seen_people[track_id] = 1
+        self.people_count += 1 - was_seen
+        
+        # Add to all current time period tracking, counting each ID once per period
+        self.minute_people_count += 1 - self.minute_seen[track_id]
+        self.minute_seen[track_id] = 1
+        self.hour_people_count += 1 - self.hour_seen[track_id]
+        self.hour_seen[track_id] = 1
+        self.day_people_count += 1 - self.day_seen[track_id]
+        self.day_seen[track_id] = 1
+        
+        return not was_seen  # Return whether this is a new person overall
+
+# -----------------------------------------------------------------------------------------------
+# Frame annotation helpers
+# -----------------------------------------------------------------------------------------------
+
+# Text style for the statistics drawn on the video (green in both RGB and BGR)
+TEXT_COLOR = (0, 255, 0)
+TEXT_LINE_SPACING = 30
+# Height of the band each text line is rendered into, and the baseline position within it
+TEXT_BAND_HEIGHT = 45
+TEXT_BAND_BASELINE = 30
+# Number of rendered text lines kept (the counters cycle through a few values)
+TEXT_CACHE_SIZE = 64
+
+def get_bgr_frame(buffer, format, width, height, out=None):
+    """
+    Get the video frame from a GStreamer buffer as a BGR NumPy array.
+    
+    RGB buffers are mapped read-only and converted straight into a new BGR array,
+    so the pixels are copied once instead of being copied out of the buffer and
+    then converted in a second full-frame pass. If the pipeline already delivers
+    BGR, the frame is only copied and no color conversion is done.
+    
+    Args:
+        buffer: GStreamer buffer holding the video frame
+        format (str): Video format from the pad caps (e.g. "RGB" or "BGR")
+        width (int): Frame width in pixels
+        height (int): Frame height in pixels
+        out (numpy.ndarray): Optional preallocated array to write the BGR frame into
+        
+    Returns:
+        numpy.ndarray: BGR frame (height x width x 3)
+    """
+    if format != "RGB" and format != "BGR":
+        # Other formats go through the generic Hailo helper
+        frame = get_numpy_from_buffer(buffer, format, width, height)
+        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=out)
+    
+    success, map_info = buffer.map(Gst.MapFlags.READ)
+    if not success:
+        raise ValueError("Buffer mapping failed")
+    try:
+        pixels = np.ndarray(shape=(height, width, 3), dtype=np.uint8, buffer=map_info.data)
+        if format == "BGR":
+            # Already in OpenCV's channel order; copy out before the buffer is unmapped
+            if out is None:
+                return pixels.copy()
+            np.copyto(out, pixels)
+            return out
+        return cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR, dst=out)
+    finally:
+        buffer.unmap(map_info)
+
+def draw_text_overlay(frame, lines, user_data):
+    """
+    Draw lines of text onto a video frame, rasterizing each distinct line only once.
+    
+    The first time a line of text is seen it is rendered with cv2.putText into a
+    small mask, which is cached. Every frame then just copies the text color into
+    the frame through the cached masks, which is much cheaper than drawing the
+    glyphs again.
+    
+    Args:
+        frame (numpy.ndarray): Frame to draw on (modified in place)
+        lines (list): Text lines, drawn 30 pixels apart starting at y=30
+        user_data: Instance of user_app_callback_class holding the overlay cache
+    """
+    height, width = frame.shape[:2]
+    
+    # Solid block of the text color that the masks are copied through
+    color_band = user_data.text_color_band
+    if color_band is None or color_band.shape[1] < width:
+        color_band = np.empty((TEXT_BAND_HEIGHT, width, 3), dtype=np.uint8)
+        color_band[:] = TEXT_COLOR
+        user_data.text_color_band = color_band
+    
+    cache = user_data.text_overlay
+    for index, text in enumerate(lines):
+        key = (index, text, width, height)
+        cached = cache.get(key)
+        if cached is None:
+            if len(cache) >= TEXT_CACHE_SIZE:
+                cache.clear()  # Counters moved on; drop renderings of old values
+            # Render the line into a band around its baseline, clipped to the frame
+            text_width = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0][0]
+            band = np.zeros((TEXT_BAND_HEIGHT, min(width, text_width + 20)), dtype=np.uint8)
+            cv2.putText(band, text, (10, TEXT_BAND_BASELINE), cv2.FONT_HERSHEY_SIMPLEX, 1, 255, 2)
+            band_top = TEXT_LINE_SPACING * (index + 1) - TEXT_BAND_BASELINE
+            first_row = max(0, -band_top)
+            last_row = max(first_row, min(TEXT_BAND_HEIGHT, height - band_top))
+            cached = (band_top + first_row, np.ascontiguousarray(band[first_row:last_row] >= 128, dtype=np.uint8))
+            cache[key] = cached
+        top, mask = cached
+        rows, cols = mask.shape
+        if rows:
+            cv2.copyTo(color_band[:rows, :cols], mask, frame[top:top + rows, :cols])
 
 # -----------------------------------------------------------------------------------------------
 # User-defined callback function
 # -----------------------------------------------------------------------------------------------
 
+def on_caps_event(pad, info, user_data):
+    """
+    Pad probe that forgets the cached video caps when new caps are negotiated.
+    
+    Args:
+        pad: GStreamer pad the event passed through
+        info: GStreamer probe info containing the event
+        user_data: Instance of user_app_callback_class holding the cached caps
+        
+    Returns:
+        Gst.PadProbeReturn.OK: Let the event continue downstream
+    """
+    event = info.get_event()
+    if event is not None and event.type == Gst.EventType.CAPS:
+        user_data.video_caps = None
+    return Gst.PadProbeReturn.OK
+
+def annotate_frame(pad, buffer, current_frame_people, user_data):
+    """
+    Extract the video frame, draw the people statistics on it and hand it to the display.
+    
+    Only called when frame processing is enabled (user_data.use_frame).
+    
+    Args:
+        pad: GStreamer pad that received the data
+        buffer: GStreamer buffer holding the video frame
+        current_frame_people (int): Number of people detected in this frame
+        user_data: Instance of user_app_callback_class for state management
+    """
+    # ===== VIDEO FRAME EXTRACTION =====
+    # Get video format information from the GStreamer pad
+    # This tells us the resolution and color format of the video. Caps only change
+    # on renegotiation, so they are cached until a CAPS event clears them.
+    if user_data.video_caps is None:
+        caps = get_caps_from_pad(pad)
+        if None not in caps:
+            user_data.video_caps = caps
+        if not user_data.caps_probe_added:
+            pad.add_probe(Gst.PadProbeType.EVENT_DOWNSTREAM, on_caps_event, user_data)
+            user_data.caps_probe_added = True
+    else:
+        caps = user_data.video_caps
+    format, width, height = caps
+    if format is None or width is None or height is None:
+        return  # Caps not negotiated yet
+    
+    # Convert GStreamer buffer to a BGR NumPy array for OpenCV processing,
+    # writing into a pooled buffer instead of allocating a new frame
+    frame = get_bgr_frame(buffer, format, width, height, out=user_data.next_frame_buffer(height, width))
+    
+    # Note: using imshow will not work here, as the callback function is not running in the main thread
+    # Instead, we add text overlays to the frame for display
+    
+    # Display the statistics on video; only lines whose text changed are re-rendered
+    draw_text_overlay(frame, [
+        f"Current Frame People: {current_frame_people}",
+        f"Current Minute People: {user_data.minute_people_count}",
+        f"Current Hour People: {user_data.hour_people_count}",
+        f"Current Day People: {user_data.day_people_count}",
+        f"Total Unique People: {user_data.people_count}",
+        # Example text from original code (kept for compatibility)
+        f"{user_data.new_function()} {user_data.new_variable}",
+    ], user_data)
+    
+    # Store the processed frame for display by the main application
+    user_data.set_frame(frame)
+
 # This is the callback function that will be called when data is available from the pipeline
 def app_callback(pad, info, user_data):
     """
@@ -253,17 +568,6 @@ def app_callback(pad, info, user_data):
     user_data.increment()
     # Note: Removed string_to_print initialization here as it's not used immediately
 
-    # ===== VIDEO FRAME EXTRACTION =====
-    # Get video format information from the GStreamer pad
-    # This tells us the resolution and color format of the video
-    format, width, height = get_caps_from_pad(pad)
-
-    # Extract video frame data if frame processing is enabled
-    frame = None
-    if user_data.use_frame and format is not None and width is not None and height is not None:
-        # Convert GStreamer buffer to NumPy array for OpenCV processing
-        frame = get_numpy_from_buffer(buffer, format, width, height)
-
     # ===== AI DETECTION PROCESSING =====
     # Extract AI detection results from the Hailo buffer
     roi = hailo.get_roi_from_buffer(buffer)
@@ -271,119 +575,90 @@ def app_callback(pad, info, user_data):
     detections = roi.get_objects_typed(hailo.HAILO_DETECTION)
 
     # ===== PEOPLE COUNTING LOGIC =====
-    # Count people detected in the current frame
-    current_frame_people = 0
     string_to_print = ""
-    # Process each detected object
-    for detection in detections:
-        # Extract detection information
-        label = detection.get_label()  # Object class (e.g., "person", "car")
-        bbox = detection.get_bbox()    # Bounding box coordinates
-        confidence = detection.get_confidence()  # Detection confidence (0-1)
-        
-        # Only process person detections
-        if label == "person":
-            # ===== CONFIDENCE THRESHOLD CHECK =====
-            # Only count people with 70% or higher confidence
-            if confidence < 0.70:
-                continue  # Skip this detection if confidence is too low
-            
-            # ===== TRACKING ID EXTRACTION =====
-            # Get the unique track ID for this person
-            # Track IDs persist across frames to identify the same person
-            track_id = 0  # Default value
-            track = detection.get_objects_typed(hailo.HAILO_UNIQUE_ID)
-            if len(track) == 1:
-                track_id = track[0].get_id()
-            
-            # ===== UNIQUE PERSON TRACKING =====
-            # Add person to tracking system and check if they're new
-            is_new_person = user_data.add_person(track_id)
-            
-            # Log detection information with different messages for new vs existing people
-            if is_new_person:
-                string_to_print = f"NEW PERSON DETECTED: ID: {track_id} Label: {label} Confidence: {confidence:.2f}\n"
-                # Immediately log to CSV for testing when a new person is detected
-                user_data.log_to_csv(len(user_data.current_minute_people)) # Log current minute people
-            else:
-                string_to_print = f"Detection: ID: {track_id} Label: {label} Confidence: {confidence:.2f}\n"
-            
-            # Increment current frame people count
-            current_frame_people += 1
+    # Keep only person detections with 70% or higher confidence in one pass, so the
+    # per-person work below never runs for other object classes or weak detections
+    person_detections = [detection for detection in detections
+                         if detection.get_label() == "person" and detection.get_confidence() >= 0.70]
+    # Count people detected in the current frame
+    current_frame_people = len(person_detections)
+    # Bind the lookups used for every person to locals once per frame
+    unique_id_type = hailo.HAILO_UNIQUE_ID
+    add_person = user_data.add_person
+    verbose = user_data.verbose
+    # Process each detected person
+    for detection in person_detections:
+        # ===== TRACKING ID EXTRACTION =====
+        # Get the unique track ID for this person
+        # Track IDs persist across frames to identify the same person
+        # (the tracker attaches it as a one-element HAILO_UNIQUE_ID list; 0 if none)
+        track = detection.get_objects_typed(unique_id_type)
+        track_id = track[0].get_id() if track else 0
+        
+        # ===== UNIQUE PERSON TRACKING =====
+        # Add person to tracking system and check if they're new
+        is_new_person = add_person(track_id)
+        
+        # Log detection information with different messages for new vs existing people.
+        # Messages for already-counted people are only built in verbose mode.
+        if is_new_person:
+            string_to_print = f"NEW PERSON DETECTED: ID: {track_id} Label: person Confidence: {detection.get_confidence():.2f}\n"
+        elif verbose:
+            string_to_print = f"Detection: ID: {track_id} Label: person Confidence: {detection.get_confidence():.2f}\n"
     
     # ===== CSV LOGGING LOGIC =====
     # Check if we've moved to a new time period and log the previous period's data
-    # This ensures we count all people detected within each time period, not just the current frame
-    current_time = time.time()
-    current_minute = int(current_time // 60)
-    current_hour = int(current_time // 3600)
-    current_day = int(current_time // 86400)
-    
-    # Check if we've moved to a new minute
-    if current_minute != user_data.current_minute:
-        # We're in a new minute, log the previous minute's data
-        people_in_last_minute = len(user_data.current_minute_people)
-        user_data.log_to_csv(people_in_last_minute)
-        string_to_print += f"Logged to CSV: {people_in_last_minute} people in the last minute, {len(user_data.tracked_people)} total unique people\n"
-        
-        # Reset current minute tracking for the new minute
-        user_data.current_minute_people.clear()
-        user_data.current_minute = current_minute
-    
-    # Check if we've moved to a new hour
-    if current_hour != user_data.current_hour:
-        # Reset current hour tracking for the new hour
-        user_data.current_hour_people.clear()
-        user_data.current_hour = current_hour
-    
-    # Check if we've moved to a new day
-    if current_day != user_data.current_day:
-        # Reset current day tracking for the new day
-        user_data.current_day_people.clear()
-        user_data.current_day = current_day
+    # This ensures we count all people detected within each time period, not just the current frame.
+    # Periods can only change at a minute boundary, so most frames just compare one integer.
+    # The monotonic clock is read once per frame and shared with the debug check below
+    now_ns = time.monotonic_ns()
+    if now_ns >= user_data.next_period_check_ns:
+        current_time = time.time()
+        current_minute = int(current_time // 60)
+        
+        # Check if we've moved to a new minute. An hour or day can only change
+        # together with the minute, so those checks are nested inside this one.
+        if current_minute != user_data.current_minute:
+            # We're in a new minute, log the previous minute's data
+            people_in_last_minute = user_data.minute_people_count
+            user_data.log_to_csv(people_in_last_minute, current_time)
+            string_to_print += f"Logged to CSV: {people_in_last_minute} people in the last minute, {user_data.people_count} total unique people\n"
+        
+            # Reset current minute tracking for the new minute
+            user_data.minute_seen = bytearray(len(user_data.seen_people))
+            user_data.minute_people_count = 0
+            user_data.current_minute = current_minute
+            
+            # Check if we've moved to a new hour
+            current_hour = int(current_time // 3600)
+            if current_hour != user_data.current_hour:
+                # Reset current hour tracking for the new hour
+                user_data.hour_seen = bytearray(len(user_data.seen_people))
+                user_data.hour_people_count = 0
+                user_data.current_hour = current_hour
+                
+                # Check if we've moved to a new day
+                current_day = int(current_time // 86400)
+                if current_day != user_data.current_day:
+                    # Reset current day tracking for the new day
+                    user_data.day_seen = bytearray(len(user_data.seen_people))
+                    user_data.day_people_count = 0
+                    user_data.current_day = current_day
+        
+        user_data.schedule_period_check()
     
     # ===== DEBUG STATUS (every 10 seconds) =====
-    user_data.debug_status()
+    user_data.debug_status(now_ns)
     
     # ===== VIDEO FRAME ANNOTATION =====
-    # Add visual information to the video frame if frame processing is enabled
+    # Add visual information to the video frame if frame processing is enabled.
+    # Headless runs skip all caps, frame and OpenCV work with this single check.
     if user_data.use_frame:
-        # Note: using imshow will not work here, as the callback function is not running in the main thread
-        # Instead, we add text overlays to the frame for display
-        
-        # Display current frame people count on video
-        cv2.putText(frame, f"Current Frame People: {current_frame_people}", (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Display people detected in current minute on video
-        cv2.putText(frame, f"Current Minute People: {len(user_data.current_minute_people)}", (10, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Display people detected in current hour on video
-        cv2.putText(frame, f"Current Hour People: {len(user_data.current_hour_people)}", (10, 90), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Display people detected in current day on video
-        cv2.putText(frame, f"Current Day People: {len(user_data.current_day_people)}", (10, 120), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Display total unique people count on video
-        cv2.putText(frame, f"Total Unique People: {len(user_data.tracked_people)}", (10, 150), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Display example text from original code (kept for compatibility)
-        cv2.putText(frame, f"{user_data.new_function()} {user_data.new_variable}", (10, 180), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Convert frame from RGB to BGR format (OpenCV uses BGR)
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-        
-        # Store the processed frame for display by the main application
-        user_data.set_frame(frame)
+        annotate_frame(pad, buffer, current_frame_people, user_data)
 
-    # Print detection information to console for monitoring
+    # Print detection information to console for monitoring (off the streaming thread)
     if string_to_print != "":
-        print(string_to_print)
+        user_data.log(string_to_print)
     
     # Return OK to indicate successful processing
     return Gst.PadProbeReturn.OK
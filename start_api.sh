@@ -21,6 +21,7 @@ PID_FILE="$API_DIR/api.pid"
 LOG_FILE="$API_DIR/api.log"
 PORT=8000
 HOST="0.0.0.0"
+WORKERS=1  # each worker keeps its own copy of the parsed log
 
 # Function to print colored output
 print_status() {
@@ -143,9 +144,10 @@ start_api() {
     print_status "Log file: $LOG_FILE"
     print_status "Press Ctrl+C to stop the server"
     
-    # Start the API in the background
+    # Start the API in the background under gunicorn (a gevent worker)
     cd "$API_DIR"
-    nohup $PYTHON_CMD "$API_FILE" > "$LOG_FILE" 2>&1 &
+    nohup $PYTHON_CMD -m gunicorn --config gunicorn.conf.py --workers "$WORKERS" \
+        --bind "$HOST:$PORT" wsgi:app > "$LOG_FILE" 2>&1 &
     API_PID=$!
     cd "$SCRIPT_DIR"
     
@@ -314,6 +316,7 @@ show_help() {
     echo "Configuration:"
     echo "  Port: $PORT"
     echo "  Host: $HOST"
+    echo "  Workers: $WORKERS"
     echo "  API Directory: $API_DIR"
     echo "  CSV File: $CSV_FILE"
     echo "  Log file: $LOG_FILE"
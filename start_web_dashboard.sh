@@ -70,6 +70,6 @@ echo "Dashboard will be available at: http://localhost:5000"
 echo "Press Ctrl+C to stop the server"
 echo
 
-# Start the web dashboard
+# Start the web dashboard under gunicorn (threaded worker, see gunicorn.conf.py)
 cd web_dashboard
-python app.py 
\ No newline at end of file
+python -m gunicorn --config gunicorn.conf.py wsgi:app 
\ No newline at end of file
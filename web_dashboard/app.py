@@ -19,11 +19,18 @@ import cv2
 import threading
 import time
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-import base64
 import numpy as np
 
+# pybase64 uses SIMD (NEON on the Raspberry Pi) for /api/camera/frame; fall back to the standard library
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 app = Flask(__name__)
 
 # Configuration
@@ -31,17 +38,37 @@ API_BASE_URL = "http://localhost:8000"
 CAMERA_INDEX = 0  # USB camera index
 TIMELAPSE_INTERVAL = 2  # seconds between captures
 TIMELAPSE_DURATION = 600  # 10 minutes in seconds
-FRAMES_DIR = Path("web_dashboard/static/frames")
+STREAM_FPS = 10  # frames per second sent on the live MJPEG stream
+MAX_STREAMS = 4  # open live streams; each one holds a server thread (see gunicorn.conf.py)
+FRAMES_DIR = Path(__file__).parent / "static" / "frames"  # timelapse JPEGs, served as /static/frames/
+
+# HTTP session reusing keep-alive connections to the API, and a pool that lets
+# the requests of one dashboard update run concurrently
+api_session = requests.Session()
+api_executor = ThreadPoolExecutor(max_workers=3)
+
+# Saved frame files never change, so browsers may reuse them for as long as they are kept
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = TIMELAPSE_DURATION
 
-# Ensure frames directory exists
+# Ensure frames directory exists, without frames left over from a previous run
 FRAMES_DIR.mkdir(parents=True, exist_ok=True)
+for old_frame in FRAMES_DIR.glob('*.jpg'):
+    old_frame.unlink(missing_ok=True)
 
 # Global variables for camera and timelapse
 camera = None
 camera_lock = threading.Lock()
-timelapse_frames = []
+# Last 10 minutes of frames (300 frames at 2-second intervals) as saved in FRAMES_DIR
+timelapse_frames = deque(maxlen=TIMELAPSE_DURATION // TIMELAPSE_INTERVAL)
 timelapse_running = False
 
+# Most recently encoded frame as (JPEG bytes, ISO timestamp, monotonic time), shared by all clients
+latest_jpeg = None
+latest_jpeg_lock = threading.Lock()
+
+# Free live stream slots, so streams can't take every thread and block page loads
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
 def init_camera():
     """Initialize USB camera."""
     global camera
@@ -70,32 +97,60 @@ def capture_frame():
     
     with camera_lock:
         ret, frame = camera.read()
-        if ret:
-            # Resize frame for web display
-            frame = cv2.resize(frame, (320, 240))
-            return frame
-        return None
+    if ret:
+        # Resize frame for web display (outside the lock so other readers aren't held up)
+        frame = cv2.resize(frame, (320, 240))
+        return frame
+    return None
+
+def get_latest_jpeg():
+    """
+    Get the current camera frame as JPEG bytes.
+    
+    A frame encoded less than one stream interval ago is reused, so concurrent
+    clients (live streams, frame requests, the timelapse) share a single capture
+    and encode instead of each doing their own.
+    
+    Returns:
+        tuple: (JPEG bytes, ISO timestamp), or (None, None) if no frame is available
+    """
+    global latest_jpeg
+    with latest_jpeg_lock:
+        if latest_jpeg is not None and time.monotonic() - latest_jpeg[2] < 1 / STREAM_FPS:
+            return latest_jpeg[0], latest_jpeg[1]
+        frame = capture_frame()
+        if frame is None:
+            return None, None
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        latest_jpeg = (buffer.tobytes(), datetime.now().isoformat(), time.monotonic())
+        return latest_jpeg[0], latest_jpeg[1]
 
 def timelapse_worker():
     """Background worker for capturing timelapse frames."""
     global timelapse_frames, timelapse_running
     
     while timelapse_running:
-        frame = capture_frame()
-        if frame is not None:
-            # Convert frame to base64 for web display
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            frame_b64 = base64.b64encode(buffer).decode('utf-8')
+        jpeg, timestamp = get_latest_jpeg()
+        # Skip a shared frame that is already in the history
+        if jpeg is not None and not (timelapse_frames and timelapse_frames[-1]['timestamp'] == timestamp):
+            # Save the JPEG as a static file, so the page loads (and caches) it directly
+            filename = f"{datetime.fromisoformat(timestamp):%Y%m%d_%H%M%S_%f}.jpg"
+            tmp_file = FRAMES_DIR / f"{filename}.tmp"
+            try:
+                tmp_file.write_bytes(jpeg)
+                os.replace(tmp_file, FRAMES_DIR / filename)
+            except OSError as e:
+                print(f"Error saving timelapse frame: {e}")
+                time.sleep(TIMELAPSE_INTERVAL)
+                continue
             
-            timestamp = datetime.now().isoformat()
+            # Delete the file of the frame that is about to drop out of the history
+            if len(timelapse_frames) == timelapse_frames.maxlen:
+                (FRAMES_DIR / timelapse_frames[0]['file']).unlink(missing_ok=True)
             timelapse_frames.append({
                 'timestamp': timestamp,
-                'frame': frame_b64
+                'file': filename
             })
-            
-            # Keep only the last 10 minutes of frames (300 frames at 2-second intervals)
-            if len(timelapse_frames) > 300:
-                timelapse_frames.pop(0)
         
         time.sleep(TIMELAPSE_INTERVAL)
 
@@ -120,22 +175,27 @@ def dashboard():
 def get_people_data():
     """Get people count data from the API."""
     try:
+        # Request current, hourly and summary data at the same time
+        current_request = api_executor.submit(api_session.get, f"{API_BASE_URL}/data/current", timeout=5)
+        hourly_request = api_executor.submit(api_session.get, f"{API_BASE_URL}/data/hourly?hours=24", timeout=5)
+        summary_request = api_executor.submit(api_session.get, f"{API_BASE_URL}/data/summary", timeout=5)
+        
         # Get current data
-        current_response = requests.get(f"{API_BASE_URL}/data/current", timeout=5)
+        current_response = current_request.result()
         current_data = current_response.json() if current_response.status_code == 200 else {}
         
         # Get hourly data
-        hourly_response = requests.get(f"{API_BASE_URL}/data/hourly?hours=24", timeout=5)
+        hourly_response = hourly_request.result()
         hourly_data = hourly_response.json() if hourly_response.status_code == 200 else {}
         
         # Get summary data
-        summary_response = requests.get(f"{API_BASE_URL}/data/summary", timeout=5)
+        summary_response = summary_request.result()
         summary_data = summary_response.json() if summary_response.status_code == 200 else {}
         
         # If any endpoint failed, try to get basic data
         if not current_data and not hourly_data and not summary_data:
             # Fallback: get all data and process it
-            all_data_response = requests.get(f"{API_BASE_URL}/data", timeout=5)
+            all_data_response = api_session.get(f"{API_BASE_URL}/data", timeout=5)
             if all_data_response.status_code == 200:
                 all_data = all_data_response.json()
                 if 'data' in all_data and all_data['data']:
@@ -163,10 +223,14 @@ def get_people_data():
 
 @app.route('/api/timelapse')
 def get_timelapse():
-    """Get timelapse frames."""
+    """Get the URLs of the timelapse frames."""
     global timelapse_frames
+    frames = [
+        {'timestamp': frame['timestamp'], 'url': f"{app.static_url_path}/frames/{frame['file']}"}
+        for frame in list(timelapse_frames)
+    ]
     return jsonify({
-        'frames': timelapse_frames,
+        'frames': frames,
         'count': len(timelapse_frames),
         'timestamp': datetime.now().isoformat()
     })
@@ -199,17 +263,37 @@ def camera_status():
 @app.route('/api/camera/frame')
 def get_camera_frame():
     """Get current camera frame."""
-    frame = capture_frame()
-    if frame is not None:
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        frame_b64 = base64.b64encode(buffer).decode('utf-8')
+    jpeg, timestamp = get_latest_jpeg()
+    if jpeg is not None:
+        frame_b64 = base64.b64encode(jpeg).decode('ascii')
         return jsonify({
             'frame': frame_b64,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         })
     else:
         return jsonify({'error': 'No frame available'}), 404
 
+def mjpeg_frames():
+    """Yield camera frames as parts of a multipart MJPEG stream."""
+    while camera is not None:
+        jpeg, _ = get_latest_jpeg()
+        if jpeg is not None:
+            yield b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
+        time.sleep(1 / STREAM_FPS)
+
+@app.route('/api/camera/stream')
+def camera_stream():
+    """Live camera view as an MJPEG stream (use as the src of an <img> tag)."""
+    if camera is None:
+        return jsonify({'error': 'Camera not initialized'}), 404
+    if not stream_slots.acquire(blocking=False):
+        return jsonify({'error': f'Too many live streams (limit {MAX_STREAMS})'}), 503
+    
+    response = Response(mjpeg_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    # The server closes the response when the client disconnects, freeing the slot
+    response.call_on_close(stream_slots.release)
+    return response
+
 if __name__ == '__main__':
     print("Starting People Counter Web Dashboard...")
     
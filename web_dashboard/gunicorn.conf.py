@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for the People Counter Web Dashboard.
+
+Usage (from the web_dashboard directory):
+    gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+bind = '0.0.0.0:5000'
+
+# A single worker owns the USB camera and the timelapse frames; more workers
+# would each try to open the camera and keep their own timelapse.
+workers = 1
+
+# Threads serve requests concurrently, so a live MJPEG stream or a slow API call
+# doesn't block other clients. Camera reads and JPEG encoding are blocking C
+# calls, which suit threads better than gevent's cooperative greenlets.
+# Each open live stream holds a thread for as long as it is viewed; app.py caps
+# them at MAX_STREAMS so the remaining threads stay free for page and API requests.
+worker_class = 'gthread'
+threads = 8
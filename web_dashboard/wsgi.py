@@ -0,0 +1,19 @@
+"""
+WSGI entry point for the People Counter Web Dashboard.
+
+Runs the Flask app under a production server instead of Flask's development
+server, e.g.:
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+from app import app, init_camera, start_timelapse
+
+# Open the camera and start the timelapse when the worker imports the app, as
+# app.py does when it is run directly
+if init_camera():
+    start_timelapse()
+else:
+    print("Warning: Camera initialization failed")
+
+__all__ = ['app']